@@ -0,0 +1,20 @@
+from state import State
+from agents.base_agent import BaseAgent
+from network import PolicyValueNetwork
+
+
+class NetworkAgent(BaseAgent):
+
+  def __init__(self, network: PolicyValueNetwork, greedy: bool = True):
+    self.network = network
+    self.greedy = greedy
+
+  def get_action(self, state: State):
+    return self.get_actions([state])[0]
+
+  def get_actions(self, states: list) -> list:
+    policies, _ = self.network.predict(states)
+    if self.greedy:
+      return [int(a) for a in policies.argmax(axis=1)]
+    random = self.network.random
+    return [int(random.choice(len(p), p=p)) for p in policies]
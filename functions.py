@@ -1,6 +1,6 @@
 import networkx as nx
 import matplotlib.pyplot as plt
-from state import State
+from state import State, Rules
 
 
 def get_dictionary_string(dictionary: dict, max_depth: float = float('inf'),
@@ -53,51 +53,60 @@ def get_tree_lengths(dictionary: dict):
   :param dictionary: dictionary to traverse
   :return: list of integers
   """
-
-  def recursion(tree: dict, level: int = 0):
-    if len(lengths) < level + 1:
-      lengths.append(0)
-
-    lengths[level] += len(tree)
-    for value in tree.values():
-      if isinstance(value, dict):
-        recursion(value, level + 1)
-
   lengths = []
-  recursion(dictionary)
+  level = [dictionary]
+  while level:
+    lengths.append(sum(len(tree) for tree in level))
+    level = [value for tree in level for value in tree.values()
+             if isinstance(value, dict)]
+
   return lengths
 
 
-def build_game_tree():
+def build_game_tree(rules: Rules = None):
   """
   Returns a dictionary representation of the game tree.
+  :param rules: rule variant to build the tree for, defaults to standard rules
   :return: dictionary of dictionaries
   """
 
-  def recursion(state: State):
+  def visit(tree: dict, state: State):
 
     if state in observed:
-      return 'visited'
+      tree[state] = 'visited'
+      return
     else:  # record visited node
       observed.add(state)
 
     if state.is_terminal():
-      return state.next_player()  # same as previous
+      tree[state] = state.next_player()  # same as previous
+      return
+
+    tree[state] = {}
+    stack.append((tree[state], iter(state.get_next_state_set())))
 
-    tree = {}
-    for next_state in state.get_next_state_set():
-      tree[next_state] = recursion(next_state)
-    return tree
+  # depth first with an explicit stack, variants can be deeper than the
+  # recursion limit
+  observed, stack = set(), []
+  game_tree = {}
+  visit(game_tree, State(rules=rules))
 
-  observed = set()
-  initial = State()
-  return {initial: recursion(initial)}, observed
+  while stack:
+    tree, next_states = stack[-1]
+    next_state = next(next_states, None)
+    if next_state is None:
+      stack.pop()
+    else:
+      visit(tree, next_state)
 
+  return game_tree, observed
 
-def build_winner_map():
+
+def build_winner_map(rules: Rules = None):
   """
   Returns a dictionary mapping states to the player that will
   win from that state.
+  :param rules: rule variant to solve, defaults to standard rules
   :return: dictionary of state -> player
   """
 
@@ -113,7 +122,7 @@ def build_winner_map():
       if all(map(lambda x: x == first, winner_list)):
         _winner_map[state] = first
 
-  def recursion(state: State):
+  def visit(state: State):
 
     if state in visited:
       return
@@ -124,16 +133,95 @@ def build_winner_map():
       winner_map[state] = state.next_player()  # same as previous player
       return
 
-    for next_state in state.get_next_state_set():
-      recursion(next_state)
+    stack.append((state, iter(state.get_next_state_set())))
+
+  # depth first with an explicit stack, a state is labelled once all of its
+  # next states were visited
+  winner_map, visited, stack = {}, set(), []
+  visit(State(rules=rules))
 
-    add_guaranteed_winner(state, winner_map)
+  while stack:
+    state, next_states = stack[-1]
+    next_state = next(next_states, None)
+    if next_state is None:
+      stack.pop()
+      add_guaranteed_winner(state, winner_map)
+    else:
+      visit(next_state)
 
-  winner_map, visited = {}, set()
-  recursion(State())
   return winner_map, visited
 
 
+def build_state_graph(rules: Rules = None):
+  """
+  Enumerates the states reachable from the initial state breadth first.
+  :param rules: rule variant to enumerate, defaults to standard rules
+  :return: dictionary of state -> set of next states (empty if terminal) and
+  dictionary of state -> number of steps from the initial state
+  """
+  initial = State(rules=rules)
+  depths = {initial: 0}
+  frontier = [initial]
+  children = {}
+
+  while frontier:
+    next_frontier = []
+    for state in frontier:
+      if state.is_terminal():
+        children[state] = set()
+        continue
+
+      next_state_set = state.get_next_state_set()
+      children[state] = next_state_set
+      for next_state in next_state_set:
+        if next_state not in depths:
+          depths[next_state] = depths[state] + 1
+          next_frontier.append(next_state)
+    frontier = next_frontier
+
+  return children, depths
+
+
+def get_outcomes(children: dict) -> dict:
+  """
+  Solves a game graph by retrograde analysis. A state is a win for the player
+  to move if any child is a loss for the next player, a loss if every child
+  is a win for the next player and a draw otherwise, i.e. if play can cycle
+  forever without either player giving up a win.
+  :param children: dictionary of state -> set of next states, empty if terminal
+  :return: dictionary of state -> 1 (win), -1 (loss) or 0 (draw) for the
+  player to move
+  """
+  parents = {state: [] for state in children}
+  for state, next_state_set in children.items():
+    for next_state in next_state_set:
+      parents[next_state].append(state)
+
+  # player to move in a terminal state has lost
+  outcomes = {state: -1 for state, next_state_set in children.items()
+              if not next_state_set}
+  remaining = {state: len(next_state_set)
+               for state, next_state_set in children.items()}
+  queue = list(outcomes)
+
+  while queue:
+    state = queue.pop()
+    for parent in parents[state]:
+      if parent in outcomes:
+        continue
+
+      if outcomes[state] == -1:
+        outcomes[parent] = 1
+        queue.append(parent)
+      else:
+        remaining[parent] -= 1
+        if remaining[parent] == 0:
+          outcomes[parent] = -1
+          queue.append(parent)
+
+  return {state: outcomes.get(state, 0) for state in children}
+
+
 def draw_tree_with_edge_labels(tree, edge_label_tag, secondary_edges,
     figure_size=(8, 6), file_name=None, alpha=.3):
   """
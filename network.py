@@ -0,0 +1,222 @@
+import numpy as np
+from state import State, Rules, DEFAULT_RULES
+from functions import build_state_graph, get_outcomes
+
+
+def encode_states(states: list) -> np.ndarray:
+  """
+  Encodes states as one-hot hand values from the perspective of the player
+  to move, the hands of the player to move first, followed by the player.
+  :param states: list of states with the same rules
+  :return: array of shape (len(states), 2 * hands * fingers + 1)
+  """
+  rules = states[0].rules
+  values = np.array([s.values for s in states]).reshape((len(states), 2, -1))
+  players = np.array([s.player for s in states])
+
+  # swap rows so the player to move is always first
+  values[players == 1] = values[players == 1, ::-1]
+
+  one_hot = np.eye(rules.fingers)[values].reshape((len(states), -1))
+  return np.hstack([one_hot, players[:, None]]).astype(float)
+
+
+def get_action_masks(states: list) -> np.ndarray:
+  """
+  Returns a boolean mask of the legal actions of each state.
+  :param states: list of non-terminal states with the same rules
+  :return: array of shape (len(states), action count)
+  """
+  masks = np.zeros((len(states), states[0].rules.get_action_count()), bool)
+  for i, state in enumerate(states):
+    masks[i, state.get_possible_actions()] = True
+  return masks
+
+
+def masked_softmax(logits: np.ndarray, masks: np.ndarray) -> np.ndarray:
+  logits = np.where(masks, logits, -np.inf)
+  exp = np.exp(logits - logits.max(axis=1, keepdims=True))
+  return exp / exp.sum(axis=1, keepdims=True)
+
+
+class PolicyValueNetwork:
+  """
+  Multilayer perceptron with relu hidden layers, a policy head producing
+  action logits and a tanh value head, trained with adam on cpu.
+  """
+
+  def __init__(self, rules: Rules = None, hidden_sizes=(64, 64),
+      learning_rate: float = 1e-3, seed: int = None):
+
+    self.rules = DEFAULT_RULES if rules is None else rules
+    self.learning_rate = learning_rate
+    self.random = np.random.default_rng(seed)
+
+    input_size = 2 * self.rules.hands * self.rules.fingers + 1
+    output_size = self.rules.get_action_count() + 1  # logits and value
+    sizes = [input_size] + list(hidden_sizes) + [output_size]
+
+    # he initialization for relu layers
+    self.weights = [self.random.normal(0, np.sqrt(2 / n), (n, m))
+                    for n, m in zip(sizes[:-1], sizes[1:])]
+    self.biases = [np.zeros(m) for m in sizes[1:]]
+
+    # adam moments and step count
+    self.m = [np.zeros_like(p) for p in self.weights + self.biases]
+    self.v = [np.zeros_like(p) for p in self.weights + self.biases]
+    self.t = 0
+
+  def forward(self, x: np.ndarray):
+    """
+    Runs the network on a batch of encoded states.
+    :param x: encoded states
+    :return: action logits, values and activations of every layer
+    """
+    activations = [x]
+    for w, b in zip(self.weights[:-1], self.biases[:-1]):
+      activations.append(np.maximum(activations[-1] @ w + b, 0))
+
+    out = activations[-1] @ self.weights[-1] + self.biases[-1]
+    return out[:, :-1], np.tanh(out[:, -1]), activations
+
+  def predict(self, states: list):
+    """
+    Scores a batch of non-terminal states.
+    :param states: list of states
+    :return: action probabilities (zero for illegal actions) and values
+    """
+    logits, values, _ = self.forward(encode_states(states))
+    return masked_softmax(logits, get_action_masks(states)), values
+
+  def train_batch(self, x: np.ndarray, masks: np.ndarray,
+      target_policies: np.ndarray, target_values: np.ndarray) -> float:
+    """
+    Takes one adam step on the sum of the masked policy cross entropy and
+    the value mean squared error.
+    :return: loss of the batch before the step
+    """
+    n = len(x)
+    logits, values, activations = self.forward(x)
+    policies = masked_softmax(logits, masks)
+
+    log_policies = np.log(np.where(masks, policies, 1))
+    policy_loss = -(target_policies * log_policies).sum() / n
+    value_loss = ((values - target_values) ** 2).mean()
+
+    # gradient of the output layer, illegal actions get no gradient
+    grad_logits = np.where(masks, policies - target_policies, 0) / n
+    grad_values = 2 * (values - target_values) * (1 - values ** 2) / n
+    grad = np.hstack([grad_logits, grad_values[:, None]])
+
+    grad_weights, grad_biases = [], []
+    for i in reversed(range(len(self.weights))):
+      grad_weights.insert(0, activations[i].T @ grad)
+      grad_biases.insert(0, grad.sum(axis=0))
+      if i > 0:
+        grad = (grad @ self.weights[i].T) * (activations[i] > 0)
+
+    self.adam_step(grad_weights + grad_biases)
+    return policy_loss + value_loss
+
+  def adam_step(self, grads: list, beta1=.9, beta2=.999, epsilon=1e-8):
+    self.t += 1
+    for i, (param, grad) in enumerate(zip(self.weights + self.biases, grads)):
+      self.m[i] = beta1 * self.m[i] + (1 - beta1) * grad
+      self.v[i] = beta2 * self.v[i] + (1 - beta2) * grad ** 2
+      m = self.m[i] / (1 - beta1 ** self.t)
+      v = self.v[i] / (1 - beta2 ** self.t)
+      param -= self.learning_rate * m / (np.sqrt(v) + epsilon)
+
+  def fit(self, states: list, target_policies: np.ndarray,
+      target_values: np.ndarray, epochs: int = 100,
+      batch_size: int = 64) -> list:
+    """
+    Trains the network with shuffled mini-batches.
+    :param states: list of non-terminal states
+    :param target_policies: target action probabilities
+    :param target_values: target values from the perspective of the player
+    :param epochs: number of passes over the data
+    :param batch_size: number of states per step
+    :return: list of mean losses of each epoch
+    """
+    x, masks = encode_states(states), get_action_masks(states)
+    target_policies = np.asarray(target_policies, dtype=float)
+    target_values = np.asarray(target_values, dtype=float)
+
+    losses = []
+    for _ in range(epochs):
+      order = self.random.permutation(len(x))
+      batch_losses = []
+      for start in range(0, len(x), batch_size):
+        batch = order[start:start + batch_size]
+        batch_losses.append(self.train_batch(
+            x[batch], masks[batch], target_policies[batch],
+            target_values[batch]))
+      losses.append(float(np.mean(batch_losses)))
+
+    return losses
+
+
+def get_solver_data(rules: Rules = None):
+  """
+  Labels the reachable states solved by retrograde analysis. The policy
+  target is uniform over the actions leading to states lost for the next
+  player, or to drawn states if there are none, or over all legal actions if
+  every action loses. The value target is 1 if the player to move wins, -1 if
+  they lose and 0 if the state is a draw.
+  :param rules: rule variant to solve, defaults to standard rules
+  :return: states, target policies and target values
+  """
+  children, _ = build_state_graph(rules)
+  outcomes = get_outcomes(children)
+  states = [state for state, next_state_set in children.items()
+            if next_state_set]
+  policies = np.zeros((len(states), states[0].rules.get_action_count()))
+  values = np.zeros(len(states))
+
+  for i, state in enumerate(states):
+    next_state_map = state.get_next_state_map()
+    winning = [action for action, next_state in next_state_map.items()
+               if outcomes[next_state] == -1]
+    drawing = [action for action, next_state in next_state_map.items()
+               if outcomes[next_state] == 0]
+    policies[i, winning or drawing or state.get_possible_actions()] = 1
+    policies[i] /= policies[i].sum()
+    values[i] = outcomes[state]
+
+  return states, policies, values
+
+
+def get_self_play_data(agent, rules: Rules = None, games: int = 100,
+    max_steps: int = 100):
+  """
+  Plays games with the agent on both sides and labels every visited state
+  with the action taken and the outcome from the perspective of the player
+  to move, 0 if the game did not finish within max_steps.
+  :param agent: agent choosing actions for both players
+  :param rules: rule variant to play, defaults to standard rules
+  :param games: number of games
+  :param max_steps: maximum number of steps per game
+  :return: states, target policies and target values
+  """
+  rules = DEFAULT_RULES if rules is None else rules
+  states, actions, values = [], [], []
+
+  for _ in range(games):
+    state, history = State(rules=rules), []
+    for _ in range(max_steps):
+      action = agent.get_action(state)
+      history.append((state.__copy__(), action))
+      state.step(action)
+      if state.is_terminal():
+        break
+
+    winner = state.next_player() if state.is_terminal() else None
+    for visited, action in history:
+      states.append(visited)
+      actions.append(action)
+      values.append(0 if winner is None else
+                    1 if winner == visited.player else -1)
+
+  policies = np.eye(rules.get_action_count())[actions]
+  return states, policies, np.array(values, dtype=float)
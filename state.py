@@ -1,22 +1,78 @@
 import numpy as np
+from itertools import product
 
-ACTIONS = {
-  0: (0, 0),
-  1: (0, 1),
-  2: (1, 0),
-  3: (1, 1),
-  # 4: split
-}
+class Rules:
+  """
+  Rule variant of the game: number of hands per player, number of sticks
+  at which a hand is taken out of the game and whether splitting is allowed.
+  """
+
+  def __init__(self, hands: int = 2, fingers: int = 5, split: bool = True):
+
+    if not isinstance(hands, int) or not isinstance(fingers, int):
+      raise TypeError('hands and fingers must be integers')
+
+    if hands < 1:
+      raise ValueError(f'hands must be at least 1 but was {hands}')
+
+    if fingers < 2:
+      raise ValueError(f'fingers must be at least 2 but was {fingers}')
+
+    if not isinstance(split, bool):
+      raise TypeError('split must be a boolean')
+
+    self.hands = hands
+    self.fingers = fingers
+    self.split = split
+
+    # pointing actions are (from, to) pairs, split is the next id after them
+    self.actions = dict(enumerate(product(range(hands), repeat=2)))
+    self.split_action = len(self.actions)
+
+    # random 64-bit keys for each number of sticks in a hand of either row
+    # and for the player to move, seeded by the rules to be reproducible
+    random = np.random.default_rng([hands, fingers, int(split)])
+    self.hand_keys = random.integers(
+        0, 2 ** 64, (2, fingers), dtype=np.uint64).tolist()
+    self.player_keys = random.integers(
+        0, 2 ** 64, 2, dtype=np.uint64).tolist()
+
+  def __eq__(self, other):
+    return isinstance(other, Rules) and self.get_tuple() == other.get_tuple()
+
+  def __hash__(self):
+    return hash(self.get_tuple())
+
+  def __str__(self):
+    return f'hands={self.hands},fingers={self.fingers},split={self.split}'
+
+  def get_tuple(self) -> tuple:
+    return self.hands, self.fingers, self.split
+
+  def get_action_count(self) -> int:
+    return self.split_action + 1
+
+
+DEFAULT_RULES = Rules()
+
+# {0: (0, 0), 1: (0, 1), 2: (1, 0), 3: (1, 1)}, 4 is split
+ACTIONS = DEFAULT_RULES.actions
 
 
 class State:
 
-  def __init__(self, player: int = None, values: np.ndarray = None):
+  def __init__(self, player: int = None, values: np.ndarray = None,
+      rules: Rules = None):
+
+    if rules is None:
+      rules = DEFAULT_RULES
+    elif not isinstance(rules, Rules):
+      raise TypeError('rules must be of type Rules')
 
     if (player is None) ^ (values is None):
       raise ValueError('player and values must both be None or both not None')
     elif player is None and values is None:
-      player, values = 0, np.ones((2, 2), dtype=int)
+      player, values = 0, np.ones((2, rules.hands), dtype=int)
 
     if not isinstance(player, int):
       raise TypeError('player must be an integer')
@@ -27,25 +83,37 @@ class State:
     if not isinstance(values, np.ndarray):
       raise TypeError('state must be a numpy array')
 
-    if values.shape != (2, 2) or values.dtype != int:
-      raise ValueError('state must be a 2x2 numpy array of integers')
+    if values.shape != (2, rules.hands) or values.dtype != int:
+      raise ValueError(
+          f'state must be a 2x{rules.hands} numpy array of integers')
 
-    if not ((values >= 0) & (values < 5)).all():
-      raise ValueError('state must be between 0 and 4')
+    if not ((values >= 0) & (values < rules.fingers)).all():
+      raise ValueError(f'state must be between 0 and {rules.fingers - 1}')
 
     self.player = player
     self.values = sorted_values(values)
+    self.rules = rules
+    self.key = get_key(player, self.values, rules)
 
   def __copy__(self):
-    return State(self.player, self.values)
+    # values are already valid and sorted, so skip the constructor and keep
+    # the key instead of recomputing it
+    state = object.__new__(State)
+    state.player = self.player
+    state.values = self.values.copy()
+    state.rules = self.rules
+    state.key = self.key
+    return state
 
   def __eq__(self, other):
     return isinstance(other, State) \
+      and self.key == other.key \
       and self.player == other.player \
+      and self.rules == other.rules \
       and np.array_equal(self.values, other.values)
 
   def __hash__(self):
-    return hash(self.get_tuple())
+    return hash(self.key)
 
   def __str__(self):
     return str(self.get_tuple())
@@ -67,23 +135,34 @@ class State:
       raise ValueError('game is over')
 
     index, index_next = self.player, self.next_player()
-    state = self.values
+    state, rules = self.values, self.rules
     possible_actions = []
 
     # add action if from and to hands are not empty
-    for key, (index_from, index_to) in ACTIONS.items():
+    for key, (index_from, index_to) in rules.actions.items():
       if state[index, index_from] > 0 and state[index_next, index_to] > 0:
         possible_actions.append(key)
 
-    # if one hand is empty and second has an even number, add split action
-    if sum(state[index] == 0) == 1 and sum(state[index] % 2 == 0) == 2:
-      possible_actions.append(4)
+    # if only one hand is not empty and its sticks can be divided evenly
+    # between all hands, add split action
+    if rules.split and rules.hands > 1 \
+        and sum(state[index] == 0) == rules.hands - 1 \
+        and sum(state[index] % rules.hands == 0) == rules.hands:
+      possible_actions.append(rules.split_action)
 
     return possible_actions
 
   def get_next_values(self, action: int):
+    return self.get_next_values_and_key(action)[0]
 
-    if action not in ACTIONS and action != 4:
+  def get_next_values_and_key(self, action: int):
+    """
+    Returns the sorted values after the action and the key of the next state,
+    updated incrementally for the hands changed by the action.
+    """
+
+    rules = self.rules
+    if action not in rules.actions and action != rules.split_action:
       raise ValueError(f'invalid action {action}')
 
     # todo or simply continue and dont increment t
@@ -91,23 +170,31 @@ class State:
     if action not in possible_actions:
       raise ValueError(f'action {action} is not possible')
 
-    index, state = self.player, self.values.copy()
+    index, index_next = self.player, self.next_player()
+    state, hand_keys = self.values.copy(), rules.hand_keys
+    key = self.key - rules.player_keys[index] + rules.player_keys[index_next]
 
-    if action == 4:
+    if action == rules.split_action:
       arr = state[index]
-      state[index] = np.full(arr.shape, arr[arr > 0] // 2)
+      key -= sum(hand_keys[index][value] for value in arr)
+      state[index] = np.full(arr.shape, arr[arr > 0] // rules.hands)
+      key += hand_keys[index][state[index, 0]] * rules.hands
     else:
-      index_next = self.next_player()
-      index_from, index_to = ACTIONS[action]
-      state[index_next, index_to] += state[index, index_from]
+      index_from, index_to = rules.actions[action]
+      value = state[index_next, index_to] + state[index, index_from]
 
-      # set 5+ numbers to 0
-      state[state >= 5] = 0
+      # set numbers at or above the finger cap to 0
+      value = value if value < rules.fingers else 0
 
-    return sorted_values(state)
+      key -= hand_keys[index_next][state[index_next, index_to]]
+      key += hand_keys[index_next][value]
+      state[index_next, index_to] = value
+
+    # key is a sum over hands, so sorting the values does not change it
+    return sorted_values(state), key % 2 ** 64
 
   def step(self, action: int):
-    self.values = self.get_next_values(action)
+    self.values, self.key = self.get_next_values_and_key(action)
     self.player = self.next_player()
 
   def get_next_state_map(self):
@@ -138,3 +225,15 @@ def sorted_values(values: np.ndarray) -> np.ndarray:
   arr = values.copy()
   arr.sort()
   return arr
+
+
+def get_key(player: int, values: np.ndarray, rules: Rules) -> int:
+  """
+  Returns the 64-bit key of a state, the sum of the keys of the player to
+  move and of the number of sticks in every hand, which does not depend on
+  the order of the hands.
+  """
+  key = rules.player_keys[player]
+  for row, hand_keys in zip(values, rules.hand_keys):
+    key += sum(hand_keys[value] for value in row)
+  return key % 2 ** 64
@@ -13,6 +13,9 @@ class Sticks:
     self.state = State()
     self.agents = [agent1, agent2]
 
+    # number of times each state was visited, by state key
+    self.visits = {self.state.key: 1}
+
   def step(self):
 
     prev_state = self.state.__copy__()
@@ -21,6 +24,7 @@ class Sticks:
 
     action = self.agents[prev_state.player].get_action(prev_state)
     self.state.step(action)
+    self.visits[self.state.key] = self.visits.get(self.state.key, 0) + 1
 
     if self.log:
       print({
@@ -34,6 +38,9 @@ class Sticks:
 
     self.t += 1
 
+  def get_repetitions(self) -> int:
+    return self.visits[self.state.key] - 1
+
   def play(self, max_steps=100):
     for _ in range(max_steps):
       self.step()
@@ -0,0 +1,122 @@
+import os
+import json
+import math
+from itertools import product
+from multiprocessing import Pool
+from state import State, Rules
+from functions import build_state_graph, get_outcomes
+
+
+def get_variant_grid(hands=(2,), fingers=(5,), split=(True,)) -> list:
+  """
+  Returns the list of rule variants in the cartesian product of the options.
+  :param hands: numbers of hands per player
+  :param fingers: numbers of sticks at which a hand is taken out of the game
+  :param split: whether splitting is allowed
+  :return: list of Rules
+  """
+  return [Rules(h, f, s) for h, f, s in product(hands, fingers, split)]
+
+
+def get_variant_stats(rules: Rules) -> dict:
+  """
+  Enumerates the states reachable from the initial state of the variant
+  breadth first and solves it by retrograde analysis.
+  :param rules: rule variant to solve
+  :return: dictionary of statistics
+  """
+  initial = State(rules=rules)
+  children, depths = build_state_graph(rules)
+  outcomes = get_outcomes(children)
+  branching = [len(s) for s in children.values() if s]
+  terminal = len(children) - len(branching)
+
+  return {
+    'variant': str(rules),
+    'hands': rules.hands,
+    'fingers': rules.fingers,
+    'split': rules.split,
+    'total_states': 2 * math.comb(rules.fingers + rules.hands - 1,
+                                  rules.hands) ** 2,
+    'reachable_states': len(depths),
+    'terminal_states': terminal,
+    'outcome': {1: 'win', -1: 'loss', 0: 'draw'}[outcomes[initial]],
+    'won_states': sum(o == 1 for o in outcomes.values()),
+    'lost_states': sum(o == -1 for o in outcomes.values()),
+    'drawn_states': sum(o == 0 for o in outcomes.values()),
+    'branching_mean': sum(branching) / len(branching) if branching else 0,
+    'branching_max': max(branching, default=0),
+    'depth_mean': sum(depths.values()) / len(depths),
+    'depth_max': max(depths.values()),
+  }
+
+
+def load_results(file_name: str) -> dict:
+  """
+  Reads the results written by run_sweep so far. Lines that can not be
+  parsed, e.g. one cut short by an interrupted sweep, are ignored.
+  :param file_name: path to the results file
+  :return: dictionary of variant string -> statistics
+  """
+  results = {}
+  if not os.path.exists(file_name):
+    return results
+
+  with open(file_name) as file:
+    for line in file:
+      try:
+        result = json.loads(line)
+      except json.JSONDecodeError:
+        continue
+      results[result['variant']] = result
+
+  return results
+
+
+def solve_variant(rules: Rules) -> dict:
+  """
+  Returns the statistics of the variant, or a record of the error if solving
+  it failed, so that one variant does not stop the rest of a sweep.
+  """
+  try:
+    return get_variant_stats(rules)
+  except Exception as error:
+    return {'variant': str(rules), 'error': repr(error)}
+
+
+def run_sweep(variants: list, file_name: str, processes: int = None,
+    log=False) -> dict:
+  """
+  Solves every variant across a process pool and appends each result to the
+  results file as soon as it is finished. Variants already present in the
+  file are not solved again, so an interrupted sweep can be resumed by
+  running it again with the same file. Variants recorded with an error are
+  solved again.
+  :param variants: list of Rules to solve
+  :param file_name: path to the results file (json lines)
+  :param processes: number of worker processes, defaults to cpu count
+  :param log: whether to print each result as it is written
+  :return: dictionary of variant string -> statistics for all variants
+  """
+  results = load_results(file_name)
+  pending = [rules for rules in dict.fromkeys(variants)
+             if str(rules) not in results or 'error' in results[str(rules)]]
+
+  if pending:
+    # terminate a line cut short by an interrupted sweep
+    if os.path.exists(file_name) and os.path.getsize(file_name) > 0:
+      with open(file_name, 'rb+') as file:
+        file.seek(-1, os.SEEK_END)
+        if file.read(1) != b'\n':
+          file.write(b'\n')
+
+    with Pool(processes) as pool, open(file_name, 'a') as file:
+      for result in pool.imap_unordered(solve_variant, pending):
+        file.write(json.dumps(result) + '\n')
+        file.flush()
+        results[result['variant']] = result
+
+        if log:
+          print(result)
+
+  return {str(rules): results[str(rules)] for rules in variants}
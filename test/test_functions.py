@@ -1,3 +1,5 @@
+import sys
+import inspect
 from functions import *
 from unittest import TestCase
 
@@ -55,3 +57,48 @@ class TestFunctions(TestCase):
         }
       }
     }), [1, 2, 2])
+
+  def test_build_game_tree(self):
+    _, observed = build_game_tree()
+    self.assertEqual(len(observed), 306)
+    self.assertEqual(len({state.key for state in observed}), 306)
+
+  def test_get_outcomes(self):
+    # a -> b -> c (terminal), a -> d <-> e cycles
+    children = {'a': {'b', 'd'}, 'b': {'c'}, 'c': set(), 'd': {'e'},
+                'e': {'d'}}
+    self.assertEqual(get_outcomes(children),
+                     {'a': 0, 'b': 1, 'c': -1, 'd': 0, 'e': 0})
+
+    # a can move to a lost state, so it is won despite the cycle
+    children['a'] = {'c', 'd'}
+    self.assertEqual(get_outcomes(children)['a'], 1)
+
+    # every move of a leads to a won state
+    children['a'] = {'b'}
+    self.assertEqual(get_outcomes(children)['a'], -1)
+
+  def test_build_state_graph(self):
+    children, depths = build_state_graph()
+    self.assertEqual(len(children), 306)
+    self.assertEqual(set(children), set(depths))
+    self.assertEqual(depths[State()], 0)
+    self.assertEqual(sum(not s for s in children.values()), 22)
+    self.assertEqual(get_outcomes(children)[State()], 0)
+
+  def test_deep_variant(self):
+    # the game tree of this variant is 257 levels deep, build it without
+    # room for one stack frame per level
+    rules = Rules(2, 7)
+    limit = sys.getrecursionlimit()
+    sys.setrecursionlimit(len(inspect.stack()) + 100)
+    try:
+      game_tree, observed = build_game_tree(rules)
+      winner_map, visited = build_winner_map(rules)
+    finally:
+      sys.setrecursionlimit(limit)
+
+    self.assertEqual(len(get_tree_lengths(game_tree)), 257)
+    self.assertEqual(len(observed), 1102)
+    self.assertEqual(visited, observed)
+    self.assertEqual(len(winner_map), 146)
@@ -0,0 +1,113 @@
+import sys
+import inspect
+import numpy as np
+from network import *
+from state import State, Rules
+from functions import build_state_graph, get_outcomes
+from agents.base_agent import BaseAgent
+from agents.random_agent import RandomAgent
+from agents.network_agent import NetworkAgent
+from unittest import TestCase
+
+
+class TestNetwork(TestCase):
+
+  def setUp(self) -> None:
+    self.initial = State()
+    self.state1 = State(1, np.array([[1, 2], [3, 4]]))
+    self.network = PolicyValueNetwork(hidden_sizes=(32,), seed=0)
+
+  def test_encode_states(self):
+    x = encode_states([self.initial, self.state1])
+    self.assertEqual(x.shape, (2, 21))
+    self.assertEqual(x[:, :-1].sum(axis=1).tolist(), [4, 4])
+    self.assertEqual(x[:, -1].tolist(), [0, 1])
+
+    # hands of the player to move come first
+    swapped = State(0, np.array([[3, 4], [1, 2]]))
+    self.assertTrue(np.array_equal(encode_states([self.state1])[0, :-1],
+                                   encode_states([swapped])[0, :-1]))
+
+    self.assertEqual(encode_states([State(rules=Rules(3, 7))]).shape, (1, 43))
+
+  def test_get_action_masks(self):
+    state = State(0, np.array([[0, 2], [3, 4]]))
+    self.assertEqual(get_action_masks([self.initial, state]).tolist(), [
+      [True, True, True, True, False],
+      [False, False, True, True, True],
+    ])
+
+  def test_predict(self):
+    state = State(0, np.array([[0, 2], [3, 4]]))
+    policies, values = self.network.predict([self.initial, state])
+    self.assertEqual(policies.shape, (2, 5))
+    self.assertEqual(values.shape, (2,))
+    self.assertTrue(np.allclose(policies.sum(axis=1), 1))
+    self.assertEqual(policies[0, 4], 0)
+    self.assertEqual(policies[1, 0], 0)
+    self.assertTrue((np.abs(values) <= 1).all())
+
+  def test_fit(self):
+    states, policies, values = get_solver_data()
+    self.assertEqual(len(states), len(policies))
+    self.assertTrue(np.allclose(policies.sum(axis=1), 1))
+
+    losses = self.network.fit(states, policies, values, epochs=20)
+    self.assertEqual(len(losses), 20)
+    self.assertLess(losses[-1], losses[0])
+
+  def test_get_solver_data(self):
+    states, policies, values = get_solver_data()
+    self.assertEqual(len(states), 284)
+    self.assertEqual([(values == v).sum() for v in [1, -1, 0]], [116, 30, 138])
+
+    outcomes = get_outcomes(build_state_graph()[0])
+    for state, policy, value in zip(states, policies, values):
+      self.assertEqual(value, outcomes[state])
+      next_outcomes = {outcomes[next_state] for action, next_state
+                       in state.get_next_state_map().items() if policy[action]}
+
+      # won states only move to states lost for the opponent, drawn states
+      # only to drawn states
+      if value == 1:
+        self.assertEqual(next_outcomes, {-1})
+      elif value == 0:
+        self.assertEqual(next_outcomes, {0})
+      else:
+        self.assertEqual(next_outcomes, {1})
+
+  def test_get_solver_data_deep_variant(self):
+    limit = sys.getrecursionlimit()
+    sys.setrecursionlimit(len(inspect.stack()) + 100)
+    try:
+      states, _, _ = get_solver_data(Rules(2, 7))
+    finally:
+      sys.setrecursionlimit(limit)
+    self.assertEqual(len(states), 1060)
+
+  def test_get_self_play_data(self):
+    states, policies, values = get_self_play_data(RandomAgent(), games=5)
+    self.assertEqual(len(states), len(policies))
+    self.assertEqual(len(states), len(values))
+    self.assertTrue(set(values) <= {-1, 0, 1})
+    self.assertEqual(states[0], self.initial)
+
+  def test_network_agent(self):
+    agent = NetworkAgent(self.network)
+    self.assertIsInstance(agent, BaseAgent)
+    self.assertIn(agent.get_action(self.state1),
+                  self.state1.get_possible_actions())
+
+    states = [self.initial, self.state1, State(0, np.array([[0, 2], [3, 4]]))]
+    actions = NetworkAgent(self.network, greedy=False).get_actions(states)
+    for state, action in zip(states, actions):
+      self.assertIn(action, state.get_possible_actions())
+
+  def test_network_agent_seeded(self):
+    def play(seed):
+      network = PolicyValueNetwork(hidden_sizes=(32,), seed=seed)
+      agent = NetworkAgent(network, greedy=False)
+      states, policies, _ = get_self_play_data(agent, games=5)
+      return [s.get_tuple() for s in states], policies.argmax(axis=1).tolist()
+
+    self.assertEqual(play(1), play(1))
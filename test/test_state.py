@@ -1,6 +1,7 @@
 import numpy as np
-from state import State
-from unittest import TestCase
+from itertools import combinations_with_replacement, product
+from state import State, Rules, get_key
+from unittest import TestCase, mock
 
 
 class TestState(TestCase):
@@ -60,10 +61,60 @@ class TestState(TestCase):
     self.assertNotEqual(self.initial, '0')
 
   def test_hash(self):
-    self.assertEqual(hash(self.initial), hash((0, 1, 1, 1, 1)))
-    self.assertEqual(hash(self.state1), hash((1, 1, 2, 3, 4)))
+    self.assertEqual(hash(self.initial), hash(self.initial.key))
+    self.assertEqual(hash(self.state1), hash(self.state1.key))
+    self.assertEqual(hash(self.initial), hash(State()))
     self.assertNotEqual(hash(self.initial), hash(self.state1))
 
+  def test_key(self):
+    # order of the hands does not matter
+    self.assertEqual(State(0, np.array([[2, 1], [4, 3]])).key,
+                     State(0, np.array([[1, 2], [3, 4]])).key)
+    self.assertNotEqual(State(0, np.array([[1, 2], [3, 4]])).key,
+                        self.state1.key)
+    self.assertNotEqual(State(0, np.array([[3, 4], [1, 2]])).key,
+                        State(0, np.array([[1, 2], [3, 4]])).key)
+    self.assertNotEqual(State().key, State(rules=Rules(split=False)).key)
+    self.assertEqual(State().key, State(rules=Rules()).key)
+
+    for state in [self.initial, self.state1]:
+      self.assertTrue(0 <= state.key < 2 ** 64)
+
+  def test_key_collisions(self):
+    for rules in [Rules(), Rules(split=False), Rules(1, 9), Rules(3, 5),
+                  Rules(2, 10), Rules(4, 4)]:
+      rows = list(combinations_with_replacement(range(rules.fingers),
+                                                rules.hands))
+      keys = set()
+      for player, row0, row1 in product([0, 1], rows, rows):
+        keys.add(get_key(player, np.array([row0, row1]), rules))
+      self.assertEqual(len(keys), 2 * len(rows) ** 2)
+
+  def test_key_traversal(self):
+    # children are copied with their key and updated incrementally, so a full
+    # traversal only computes the key of the initial state from scratch
+    from functions import build_winner_map
+    with mock.patch('state.get_key', wraps=get_key) as full_key:
+      _, visited = build_winner_map()
+    self.assertEqual(len(visited), 306)
+    self.assertEqual(full_key.call_count, 1)
+
+  def test_key_incremental(self):
+    for rules in [Rules(), Rules(3, 5), Rules(2, 7)]:
+      visited, frontier = set(), [State(rules=rules)]
+      while frontier:
+        state = frontier.pop()
+        if state in visited or state.is_terminal():
+          continue
+        visited.add(state)
+
+        for action in state.get_possible_actions():
+          next_state = state.__copy__()
+          next_state.step(action)
+          self.assertEqual(next_state.key, get_key(
+              next_state.player, next_state.values, rules))
+          frontier.append(next_state)
+
   def test_str(self):
     self.assertEqual(str(self.initial), '(0, 1, 1, 1, 1)')
     self.assertEqual(str(self.state1), '(1, 1, 2, 3, 4)')
@@ -73,6 +124,12 @@ class TestState(TestCase):
     self.assertEqual(self.state1, self.state1.__copy__())
     self.assertNotEqual(self.initial, self.state1.__copy__())
 
+    copy = self.state1.__copy__()
+    self.assertEqual(copy.key, self.state1.key)
+    self.assertEqual(copy.rules, self.state1.rules)
+    copy.values[0, 0] = 0
+    self.assertEqual(self.state1.get_tuple()[1], 1)
+
   def test_get_next_agent(self):
     self.assertEqual(self.initial.next_player(), 1)
     self.assertEqual(self.state1.next_player(), 0)
@@ -216,3 +273,49 @@ class TestState(TestCase):
                        State(1, np.array([[0, 2], [1, 3]])),
                        State(1, np.array([[1, 1], [1, 1]])),
                      })
+
+  def test_rules(self):
+    with self.assertRaises(TypeError):
+      Rules('2')
+
+    with self.assertRaises(ValueError):
+      Rules(0)
+
+    with self.assertRaises(ValueError):
+      Rules(2, 1)
+
+    with self.assertRaises(TypeError):
+      Rules(2, 5, 1)
+
+    with self.assertRaises(TypeError):
+      State(rules=(2, 5, True))
+
+    self.assertEqual(Rules().get_action_count(), 5)
+    self.assertEqual(Rules(3).get_action_count(), 10)
+    self.assertEqual(Rules(), Rules(2, 5, True))
+    self.assertNotEqual(Rules(), Rules(split=False))
+    self.assertNotEqual(State(), State(rules=Rules(split=False)))
+
+  def test_rules_variants(self):
+    three_hands = Rules(hands=3)
+    self.assertEqual(State(rules=three_hands).get_tuple(), (0, 1, 1, 1, 1, 1, 1))
+
+    with self.assertRaises(ValueError):
+      State(0, np.ones((2, 2), dtype=int), three_hands)
+
+    # split divides sticks evenly between all hands
+    state = State(0, np.array([[0, 0, 3], [1, 1, 1]]), three_hands)
+    self.assertEqual(state.get_possible_actions(), [6, 7, 8, 9])
+    self.assertTrue(np.array_equal(state.get_next_values(9),
+                                   np.array([[1, 1, 1], [1, 1, 1]])))
+
+    # no split action without the split rule
+    state = State(0, np.array([[0, 2], [1, 1]]), Rules(split=False))
+    self.assertEqual(state.get_possible_actions(), [2, 3])
+
+    # finger cap decides when a hand is taken out of the game
+    state = State(0, np.array([[4, 4], [1, 4]]), Rules(fingers=8))
+    self.assertTrue(np.array_equal(state.get_next_values(3),
+                                   np.array([[4, 4], [0, 1]])))
+    self.assertTrue(np.array_equal(state.get_next_values(2),
+                                   np.array([[4, 4], [4, 5]])))
@@ -0,0 +1,40 @@
+from state import State
+from sticks import Sticks
+from agents.base_agent import BaseAgent
+from unittest import TestCase
+
+
+class ScriptedAgent(BaseAgent):
+  def __init__(self, actions: list):
+    self.actions = actions
+    self.t = 0
+
+  def get_action(self, state: State):
+    action = self.actions[self.t % len(self.actions)]
+    self.t += 1
+    return action
+
+
+class TestSticks(TestCase):
+
+  def test_repetitions(self):
+    # players split back to one stick in each hand after eight steps
+    game = Sticks(ScriptedAgent([0, 0, 2, 4]), ScriptedAgent([0, 0, 3, 4]))
+    initial = State()
+    self.assertEqual(game.visits, {initial.key: 1})
+    self.assertEqual(game.get_repetitions(), 0)
+
+    for _ in range(7):
+      game.step()
+      self.assertEqual(game.get_repetitions(), 0)
+
+    game.step()
+    self.assertEqual(game.state, initial)
+    self.assertEqual(game.get_repetitions(), 1)
+    self.assertEqual(len(game.visits), 8)
+
+    game.play(max_steps=8)
+    self.assertFalse(game.state.is_terminal())
+    self.assertEqual(game.get_repetitions(), 2)
+    self.assertEqual(game.visits[initial.key], 3)
+    self.assertEqual(sum(game.visits.values()), 17)
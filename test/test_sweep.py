@@ -0,0 +1,72 @@
+import os
+import json
+import tempfile
+from sweep import *
+from unittest import TestCase
+
+
+class TestSweep(TestCase):
+
+  def setUp(self) -> None:
+    self.directory = tempfile.TemporaryDirectory()
+    self.file_name = os.path.join(self.directory.name, 'results.jsonl')
+
+  def tearDown(self) -> None:
+    self.directory.cleanup()
+
+  def test_get_variant_grid(self):
+    self.assertEqual(get_variant_grid(), [Rules()])
+    self.assertEqual(get_variant_grid((2, 3), (5, 7), (True, False)),
+                     [Rules(h, f, s) for h in (2, 3) for f in (5, 7)
+                      for s in (True, False)])
+
+  def test_get_variant_stats(self):
+    stats = get_variant_stats(Rules())
+    self.assertEqual(stats['variant'], 'hands=2,fingers=5,split=True')
+    self.assertEqual(stats['total_states'], 450)
+    self.assertEqual(stats['reachable_states'], 306)
+    self.assertEqual(stats['terminal_states'], 22)
+    self.assertEqual(stats['outcome'], 'draw')
+    self.assertEqual(stats['won_states'] + stats['lost_states']
+                     + stats['drawn_states'], 306)
+    self.assertEqual(stats['depth_max'], 14)
+    self.assertEqual(stats['branching_max'], 4)
+
+    self.assertEqual(get_variant_stats(Rules(split=False))['outcome'], 'loss')
+    self.assertEqual(get_variant_stats(Rules(3))['outcome'], 'win')
+    self.assertEqual(get_variant_stats(Rules(3))['total_states'], 2450)
+
+  def test_run_sweep(self):
+    variants = get_variant_grid((2,), (4, 5), (True, False))
+    results = run_sweep(variants, self.file_name, processes=2)
+    self.assertEqual(list(results), [str(rules) for rules in variants])
+    self.assertEqual(results[str(Rules())]['reachable_states'], 306)
+    self.assertEqual(load_results(self.file_name), results)
+
+  def test_run_sweep_resume(self):
+    done = get_variant_stats(Rules())
+    done['reachable_states'] = -1  # marker to show it is not solved again
+
+    # one finished variant and a line cut short by an interruption
+    with open(self.file_name, 'w') as file:
+      file.write(json.dumps(done) + '\n')
+      file.write('{"variant": "hands=2,fin')
+
+    variants = [Rules(), Rules(split=False)]
+    results = run_sweep(variants, self.file_name, processes=1)
+    self.assertEqual(results[str(Rules())]['reachable_states'], -1)
+    self.assertEqual(load_results(self.file_name), results)
+
+  def test_run_sweep_error(self):
+    # a variant that fails is recorded and does not stop the others
+    variants = ['invalid', Rules()]
+    results = run_sweep(variants, self.file_name, processes=1)
+    self.assertIn('TypeError', results['invalid']['error'])
+    self.assertEqual(results[str(Rules())]['reachable_states'], 306)
+
+    # failed variants are solved again when the sweep is resumed
+    with open(self.file_name) as file:
+      self.assertEqual(len(file.readlines()), 2)
+    run_sweep(variants, self.file_name, processes=1)
+    with open(self.file_name) as file:
+      self.assertEqual(len(file.readlines()), 3)